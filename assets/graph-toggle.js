@@ -1,9 +1,14 @@
 /**
  * Graph Toggle Integration for PreTeXt
  * Canvas-based force-directed graph for smooth interactions
+ *
+ * On a note's page only that note's precomputed neighborhood is loaded;
+ * the full graph is fetched on request or when no neighborhood exists.
  */
 
 const GRAPH_DATA_URL = 'graph/notes-graph.json';
+const NEIGHBORHOOD_DATA_DIR = 'graph/neighborhoods/';
+const NOTE_ID_PREFIX = 'sec-';
 
 let graphInstance = null;
 let isGraphVisible = false;
@@ -113,9 +118,8 @@ async function initializeGraph() {
     const container = document.getElementById('graph-container');
     if (!container) return;
 
-    const response = await fetch(GRAPH_DATA_URL);
-    if (!response.ok) throw new Error(`Failed to load graph data: ${response.status}`);
-    const data = await response.json();
+    const noteId = currentNoteId();
+    const data = (noteId && await loadNeighborhood(noteId)) || await loadFullGraph();
 
     graphInstance = createCanvasGraph(d3, container, data);
   } catch (error) {
@@ -130,6 +134,42 @@ async function initializeGraph() {
   }
 }
 
+async function showFullGraph() {
+  const container = document.getElementById('graph-container');
+  if (!container) return;
+
+  try {
+    const data = await loadFullGraph();
+    if (graphInstance) graphInstance.destroy();
+    graphInstance = createCanvasGraph(d3, container, data);
+  } catch (error) {
+    console.error('Error loading full graph:', error);
+  }
+}
+
+// Every note's page is named after its xml:id, which always starts with
+// NOTE_ID_PREFIX; other pages (index, frontmatter, chapters) have no neighborhood
+function currentNoteId() {
+  const page = window.location.pathname.split('/').pop();
+  if (!page.startsWith(NOTE_ID_PREFIX) || !page.endsWith('.html')) return null;
+  return page.slice(0, -'.html'.length);
+}
+
+async function loadNeighborhood(noteId) {
+  try {
+    const response = await fetch(`${NEIGHBORHOOD_DATA_DIR}${encodeURIComponent(noteId)}.json`);
+    return response.ok ? await response.json() : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+async function loadFullGraph() {
+  const response = await fetch(GRAPH_DATA_URL);
+  if (!response.ok) throw new Error(`Failed to load graph data: ${response.status}`);
+  return response.json();
+}
+
 function createCanvasGraph(d3, container, data) {
   const width = container.clientWidth;
   const height = container.clientHeight;
@@ -143,6 +183,9 @@ function createCanvasGraph(d3, container, data) {
     <button class="graph-btn zoom-out" title="Zoom Out">−</button>
     <button class="graph-btn zoom-reset" title="Reset View">⟲</button>
   `;
+  if (data.center) {
+    controls.innerHTML += '<button class="graph-btn full-graph" title="Show Full Graph">◎</button>';
+  }
   container.appendChild(controls);
 
   const tooltip = document.createElement('div');
@@ -228,7 +271,11 @@ function createCanvasGraph(d3, container, data) {
       ctx.fillStyle = isHovered ? '#00e8ff' : getNodeColor(node.id);
       ctx.fill();
       
-      if (isHovered) {
+      if (node.id === data.center) {
+        ctx.strokeStyle = '#ffffff';
+        ctx.lineWidth = 3 / transform.k;
+        ctx.stroke();
+      } else if (isHovered) {
         ctx.strokeStyle = '#00e8ff';
         ctx.lineWidth = 2 / transform.k;
         ctx.stroke();
@@ -352,16 +399,25 @@ function createCanvasGraph(d3, container, data) {
   controls.querySelector('.zoom-reset').addEventListener('click', () => {
     d3.select(canvas).transition().duration(500).call(zoom.transform, d3.zoomIdentity);
   });
+  if (data.center) {
+    controls.querySelector('.full-graph').addEventListener('click', showFullGraph);
+  }
 
-  window.addEventListener('resize', () => {
+  function onResize() {
     const newWidth = container.clientWidth;
     const newHeight = container.clientHeight;
     canvas.width = newWidth;
     canvas.height = newHeight;
     simulation.force('center', d3.forceCenter(newWidth / 2, newHeight / 2)).alpha(0.3).restart();
-  });
+  }
+  window.addEventListener('resize', onResize);
+
+  function destroy() {
+    simulation.stop();
+    window.removeEventListener('resize', onResize);
+  }
 
-  return { simulation, canvas, zoom };
+  return { simulation, canvas, zoom, destroy };
 }
 
 function buildTooltip(node) {
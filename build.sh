@@ -19,6 +19,13 @@ mkdir -p output/web/graph
 cp graph-module/graph.js output/web/graph/
 cp graph-module/graph.css output/web/graph/
 cp graph-module/notes-graph.json output/web/graph/
+cp graph-module/notes-graph.versions.json output/web/graph/
+if [ -d graph-module/deltas ]; then
+  cp -r graph-module/deltas output/web/graph/
+fi
+if [ -d graph-module/neighborhoods ]; then
+  cp -r graph-module/neighborhoods output/web/graph/
+fi
 cp assets/graph-toggle.js output/web/graph/
 cp assets/d3.min.js output/web/graph/
 
@@ -2,14 +2,36 @@
 """
 Zettel Graph Generator
 Automatically updates notes-graph.json from your PreTeXt sections.
+
+Each build is stamped with a content-hash version. When the graph changes,
+a delta file listing added, removed and changed nodes and links is written
+next to it, so clients holding an older copy only fetch what changed.
+
+With --store, nodes and links are read from the converter's SQLite vault
+store instead of parsing the PreTeXt sections.
+
+For each note, its k-hop neighborhood is also written to a small JSON file
+so a page's graph view can load just that note's surroundings.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
+import sys
 from pathlib import Path
 from datetime import datetime
 
+GRAPH_PATH = Path('graph-module/notes-graph.json')
+VERSIONS_PATH = Path('graph-module/notes-graph.versions.json')
+DELTAS_DIR = Path('graph-module/deltas')
+MAX_DELTAS = 20
+NEIGHBORHOODS_DIR = Path('graph-module/neighborhoods')
+DEFAULT_HOPS = 2
+DEFAULT_MAX_NEIGHBORS = 15
+DEFAULT_MAX_NODES = 50
+
 def extract_metadata(ptx_content):
     """Extract metadata from a PreTeXt section file."""
     metadata = {
@@ -46,28 +68,265 @@ def extract_metadata(ptx_content):
 def extract_links(ptx_content, section_id):
     """Extract internal links from a section."""
     links = []
+    seen = set()
     
     # Find all xref references
     xref_pattern = r'<xref\s+ref="([^"]+)"'
     for match in re.finditer(xref_pattern, ptx_content):
         target_id = match.group(1)
-        if target_id != section_id:  # Don't link to self
+        if target_id != section_id and target_id not in seen:  # Don't link to self
+            seen.add(target_id)
             links.append({
                 'source': section_id,
                 'target': target_id,
-                'type': 'references'
+                'type': 'reference'
             })
     
     return links
 
-def generate_graph():
-    """Generate the notes graph from PreTeXt files."""
-    sections_dir = Path('source/sections')
+def compute_importance(nodes, links, damping=0.85, iterations=30):
+    """
+    Score each node by PageRank over the link graph, scaled so the most
+    important note scores 1. The graph module uses this to decide which
+    labels to draw when zoomed out.
     
-    if not sections_dir.exists():
-        print(f"Error: {sections_dir} not found")
+    Scores are rounded to 2 decimals. PageRank is global, so finer values
+    would change on many notes after any edit near a hub and bloat deltas
+    and neighborhood rewrites.
+    """
+    if not nodes:
         return
     
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    out_edges = [[] for _ in nodes]
+    for link in links:
+        source = index.get(link['source'])
+        target = index.get(link['target'])
+        if source is not None and target is not None:
+            out_edges[source].append(target)
+    
+    count = len(nodes)
+    rank = [1.0 / count] * count
+    for _ in range(iterations):
+        dangling = sum(r for r, targets in zip(rank, out_edges) if not targets)
+        base = (1 - damping) / count + damping * dangling / count
+        next_rank = [base] * count
+        for source, targets in enumerate(out_edges):
+            if targets:
+                share = damping * rank[source] / len(targets)
+                for target in targets:
+                    next_rank[target] += share
+        rank = next_rank
+    
+    top = max(rank)
+    for node, r in zip(nodes, rank):
+        node['importance'] = round(r / top, 2)
+
+def build_adjacency(nodes, links, max_neighbors):
+    """
+    Index the graph by node position for neighborhood searches.
+    
+    Returns undirected neighbor lists capped to each node's max_neighbors
+    most important neighbors, so hubs do not pull in most of the vault,
+    each node's outgoing links keyed by target, and the sort key ranking
+    nodes by importance.
+    """
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    neighbors = [set() for _ in nodes]
+    outgoing = [{} for _ in nodes]
+    for link in links:
+        source = index.get(link['source'])
+        target = index.get(link['target'])
+        if source is None or target is None or source == target:
+            continue
+        neighbors[source].add(target)
+        neighbors[target].add(source)
+        outgoing[source].setdefault(target, link)
+    
+    rank = [(-node.get('importance', 0), node['id']) for node in nodes]
+    capped = [sorted(adjacent, key=rank.__getitem__)[:max_neighbors] for adjacent in neighbors]
+    return capped, outgoing, rank
+
+def local_neighborhood(center, capped, rank, hops, max_nodes):
+    """
+    Breadth-first search from center, one whole frontier at a time.
+    
+    Each level adds the most important unseen nodes until max_nodes is
+    reached, so the result is ordered by distance from the center.
+    """
+    members = [center]
+    reached = {center}
+    frontier = [center]
+    for _ in range(hops):
+        if len(members) >= max_nodes:
+            break
+        candidates = set()
+        for node in frontier:
+            candidates.update(capped[node])
+        candidates -= reached
+        if not candidates:
+            break
+        frontier = sorted(candidates, key=rank.__getitem__)[:max_nodes - len(members)]
+        reached.update(frontier)
+        members.extend(frontier)
+    return members
+
+def write_neighborhoods(nodes, links, hops, max_neighbors, max_nodes):
+    """
+    Write NEIGHBORHOODS_DIR/<id>.json with each note's local subgraph.
+    
+    The degree cap only limits which notes the search expands; every link
+    between two members is kept. Nodes keep only the fields a page graph
+    draws (no descriptions) and are encoded once, then joined per note.
+    Only files whose content changed are rewritten, and files for notes
+    that no longer exist are removed.
+    """
+    NEIGHBORHOODS_DIR.mkdir(parents=True, exist_ok=True)
+    capped, outgoing, rank = build_adjacency(nodes, links, max_neighbors)
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    encoded_nodes = [
+        encode({key: node[key] for key in ('id', 'title', 'url', 'tags', 'importance')
+                if key in node})
+        for node in nodes
+    ]
+    outgoing = [{target: encode(link) for target, link in out.items()} for out in outgoing]
+    
+    expected = set()
+    updated = 0
+    for center, node in enumerate(nodes):
+        members = local_neighborhood(center, capped, rank, hops, max_nodes)
+        member_set = set(members)
+        
+        # Walk whichever is shorter, so hubs with many links stay cheap
+        sub_links = []
+        for source in members:
+            out = outgoing[source]
+            if len(out) <= len(members):
+                sub_links.extend(link for target, link in out.items() if target in member_set)
+            else:
+                sub_links.extend(out[target] for target in members if target in out)
+        
+        data = ('{"center":%s,"hops":%d,"nodes":[%s],"links":[%s]}' % (
+            encode(node['id']), hops,
+            ','.join(encoded_nodes[i] for i in members),
+            ','.join(sub_links)
+        )).encode('utf-8')
+        
+        path = NEIGHBORHOODS_DIR / f"{node['id']}.json"
+        expected.add(path.name)
+        if not path.exists() or path.stat().st_size != len(data) or path.read_bytes() != data:
+            path.write_bytes(data)
+            updated += 1
+    
+    for stale in NEIGHBORHOODS_DIR.glob('*.json'):
+        if stale.name not in expected:
+            stale.unlink()
+    
+    print(f"  Neighborhoods: {len(nodes)} notes, {updated} updated ({NEIGHBORHOODS_DIR})")
+
+def graph_version(nodes, links):
+    """Content hash of the graph, independent of key order and build time."""
+    canonical = json.dumps({'nodes': nodes, 'links': links},
+                           sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+def link_key(link):
+    """Identity of a link within the graph."""
+    return (link['source'], link['target'], link.get('type'))
+
+def load_previous_graph(path):
+    """Load the previously generated graph, or None if unavailable."""
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            previous = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if 'nodes' not in previous or 'links' not in previous:
+        return None
+    return previous
+
+def diff_graphs(old, new, old_version):
+    """Compute the added, removed and changed nodes and links from old to new."""
+    old_nodes = {n['id']: n for n in old['nodes']}
+    new_nodes = {n['id']: n for n in new['nodes']}
+    old_links = {link_key(l): l for l in old['links']}
+    new_links = {link_key(l): l for l in new['links']}
+    
+    return {
+        'from': old_version,
+        'to': new['metadata']['version'],
+        'metadata': new['metadata'],
+        'nodes': {
+            'added': [n for i, n in new_nodes.items() if i not in old_nodes],
+            'removed': [i for i in old_nodes if i not in new_nodes],
+            'changed': [n for i, n in new_nodes.items()
+                        if i in old_nodes and old_nodes[i] != n]
+        },
+        'links': {
+            'added': [l for k, l in new_links.items() if k not in old_links],
+            'removed': [{'source': k[0], 'target': k[1], 'type': k[2]}
+                        for k in old_links if k not in new_links],
+            'changed': [l for k, l in new_links.items()
+                        if k in old_links and old_links[k] != l]
+        }
+    }
+
+def delta_filename(from_version, to_version):
+    return f"{from_version}-{to_version}.json"
+
+def write_delta(delta):
+    """Write a delta file into the deltas directory."""
+    DELTAS_DIR.mkdir(parents=True, exist_ok=True)
+    delta_path = DELTAS_DIR / delta_filename(delta['from'], delta['to'])
+    with open(delta_path, 'w') as f:
+        json.dump(delta, f, indent=2)
+    print(f"  Delta: {delta_path}")
+
+def write_versions_manifest(version, previous_version):
+    """
+    Record the current version and the chain of available deltas.
+    
+    Only the newest MAX_DELTAS deltas are kept; older delta files are
+    removed, and clients further behind fall back to the full graph.
+    """
+    deltas = []
+    if VERSIONS_PATH.exists():
+        try:
+            with open(VERSIONS_PATH) as f:
+                deltas = json.load(f).get('deltas', [])
+        except (OSError, json.JSONDecodeError):
+            deltas = []
+    
+    if previous_version:
+        filename = delta_filename(previous_version, version)
+        deltas.append({
+            'from': previous_version,
+            'to': version,
+            'file': f"{DELTAS_DIR.name}/{filename}"
+        })
+    
+    expired, deltas = deltas[:-MAX_DELTAS], deltas[-MAX_DELTAS:]
+    for entry in expired:
+        expired_path = DELTAS_DIR / Path(entry['file']).name
+        if expired_path.exists():
+            expired_path.unlink()
+    
+    with open(VERSIONS_PATH, 'w') as f:
+        json.dump({'version': version, 'deltas': deltas}, f, indent=2)
+
+def load_store_graph(store_path):
+    """Read nodes and links from a vault store written by convert.py --store."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent / 'obsidian-to-pretext'))
+    from vault_store import VaultStore
+    
+    with VaultStore(store_path) as store:
+        graph = store.graph_data()
+    return graph['nodes'], graph['links']
+
+def scan_sections(sections_dir):
+    """Read nodes and links from the PreTeXt section files."""
     nodes = []
     links = []
     
@@ -93,6 +352,39 @@ def generate_graph():
             section_links = extract_links(content, metadata['id'])
             links.extend(section_links)
     
+    return nodes, links
+
+def generate_graph(store_path=None, hops=DEFAULT_HOPS,
+                   max_neighbors=DEFAULT_MAX_NEIGHBORS, max_nodes=DEFAULT_MAX_NODES):
+    """Generate the notes graph from PreTeXt files or a vault store."""
+    if store_path:
+        if not Path(store_path).exists():
+            print(f"Error: {store_path} not found")
+            return
+        nodes, links = load_store_graph(store_path)
+    else:
+        sections_dir = Path('source/sections')
+        if not sections_dir.exists():
+            print(f"Error: {sections_dir} not found")
+            return
+        nodes, links = scan_sections(sections_dir)
+    
+    compute_importance(nodes, links)
+    write_neighborhoods(nodes, links, hops, max_neighbors, max_nodes)
+    
+    version = graph_version(nodes, links)
+    previous = load_previous_graph(GRAPH_PATH)
+    previous_version = None
+    if previous:
+        stamped_version = previous.get('metadata', {}).get('version')
+        if stamped_version == version and VERSIONS_PATH.exists():
+            print(f"✓ Graph unchanged (version {version}), nothing to write")
+            return
+        previous_version = (stamped_version
+                            or graph_version(previous['nodes'], previous['links']))
+        if previous_version == version:
+            previous_version = None
+    
     # Build graph structure
     graph = {
         '$schema': 'notes-graph-schema.json',
@@ -100,6 +392,7 @@ def generate_graph():
             'title': 'Eigenscribe Zettelkasten',
             'description': 'Interactive visualization of note connections',
             'generated': datetime.now().isoformat(),
+            'version': version,
             'total_notes': len(nodes),
             'total_links': len(links)
         },
@@ -107,13 +400,28 @@ def generate_graph():
         'links': links
     }
     
+    # Write delta from the previous build before replacing it
+    if previous_version:
+        delta = diff_graphs(previous, graph, previous_version)
+        write_delta(delta)
+    write_versions_manifest(version, previous_version)
+    
     # Write to file
-    output_path = Path('graph-module/notes-graph.json')
-    with open(output_path, 'w') as f:
+    with open(GRAPH_PATH, 'w') as f:
         json.dump(graph, f, indent=2)
     
     print(f"✓ Generated graph with {len(nodes)} notes and {len(links)} links")
-    print(f"  Output: {output_path}")
+    print(f"  Output: {GRAPH_PATH} (version {version})")
 
 if __name__ == '__main__':
-    generate_graph()
+    parser = argparse.ArgumentParser(description='Generate graph-module/notes-graph.json')
+    parser.add_argument('--store', metavar='PATH',
+                        help='Read notes from a vault store written by convert.py --store')
+    parser.add_argument('--hops', type=int, default=DEFAULT_HOPS,
+                        help='Radius of each note\'s neighborhood graph')
+    parser.add_argument('--max-neighbors', type=int, default=DEFAULT_MAX_NEIGHBORS,
+                        help='Neighbors followed from any one note (caps hubs)')
+    parser.add_argument('--max-nodes', type=int, default=DEFAULT_MAX_NODES,
+                        help='Largest number of notes in a neighborhood graph')
+    args = parser.parse_args()
+    generate_graph(args.store, args.hops, args.max_neighbors, args.max_nodes)
@@ -9,6 +9,344 @@
  */
 
 const D3_CDN = 'https://cdn.jsdelivr.net/npm/d3@7/+esm';
+const GRAPH_CACHE_DB = 'notes-graph-cache';
+const GRAPH_CACHE_STORE = 'graphs';
+
+async function fetchJSON(url, init) {
+  const response = await fetch(url, init);
+  if (!response.ok) throw new Error(`Failed to load: ${response.status}`);
+  return response.json();
+}
+
+function openGraphCache() {
+  return new Promise((resolve) => {
+    if (typeof indexedDB === 'undefined') return resolve(null);
+    const request = indexedDB.open(GRAPH_CACHE_DB, 1);
+    request.onupgradeneeded = () => request.result.createObjectStore(GRAPH_CACHE_STORE);
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => resolve(null);
+  });
+}
+
+async function readCachedGraph(key) {
+  const db = await openGraphCache();
+  if (!db) return null;
+  return new Promise((resolve) => {
+    const request = db.transaction(GRAPH_CACHE_STORE).objectStore(GRAPH_CACHE_STORE).get(key);
+    request.onsuccess = () => resolve(request.result || null);
+    request.onerror = () => resolve(null);
+  });
+}
+
+async function writeCachedGraph(key, entry) {
+  const db = await openGraphCache();
+  if (!db) return;
+  return new Promise((resolve) => {
+    const tx = db.transaction(GRAPH_CACHE_STORE, 'readwrite');
+    tx.objectStore(GRAPH_CACHE_STORE).put(entry, key);
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => resolve();
+  });
+}
+
+function linkKey(link) {
+  return `${link.source}\u0000${link.target}\u0000${link.type ?? ''}`;
+}
+
+function applyGraphDelta(data, delta) {
+  const nodes = new Map(data.nodes.map(n => [n.id, n]));
+  delta.nodes.removed.forEach(id => nodes.delete(id));
+  delta.nodes.changed.forEach(n => nodes.set(n.id, n));
+  delta.nodes.added.forEach(n => nodes.set(n.id, n));
+
+  const links = new Map(data.links.map(l => [linkKey(l), l]));
+  delta.links.removed.forEach(l => links.delete(linkKey(l)));
+  delta.links.changed.forEach(l => links.set(linkKey(l), l));
+  delta.links.added.forEach(l => links.set(linkKey(l), l));
+
+  return {
+    ...data,
+    metadata: delta.metadata,
+    nodes: [...nodes.values()],
+    links: [...links.values()]
+  };
+}
+
+function endpointId(endpoint) {
+  return typeof endpoint === 'object' ? endpoint.id : endpoint;
+}
+
+function normalizeTag(tag) {
+  return String(tag).replace(/^#/, '').split('/').map(p => p.trim()).filter(Boolean).join('/');
+}
+
+/**
+ * Index tags to note ids in one pass. Nested tags ('a/b') are also
+ * indexed under each ancestor ('a').
+ */
+function buildTagIndex(nodes) {
+  const index = new Map();
+  nodes.forEach(node => {
+    (node.tags || []).forEach(tag => {
+      const parts = normalizeTag(tag).split('/');
+      for (let depth = 1; depth <= parts.length; depth++) {
+        const key = parts.slice(0, depth).join('/');
+        if (!key) continue;
+        if (!index.has(key)) index.set(key, new Set());
+        index.get(key).add(node.id);
+      }
+    });
+  });
+  return new Map([...index].map(([tag, ids]) => [tag, [...ids].sort()]));
+}
+
+/**
+ * Canvas backend for large graphs.
+ *
+ * Nodes are indexed in a quadtree that serves both viewport culling and
+ * hover/click hit testing. Links and nodes are batched into a few paths per
+ * frame, tiny nodes are drawn as squares, and labels appear by importance as
+ * the zoom level approaches `labelZoomThreshold`.
+ */
+class CanvasRenderer {
+  constructor(graph, canvas) {
+    this.graph = graph;
+    this.canvas = canvas;
+    this.ctx = canvas.getContext('2d');
+    this.nodes = [];
+    this.links = [];
+    this.radii = new Map();
+    this.importance = new Map();
+    this.neighbors = new Map();
+    this.maxRadius = 0;
+    this.quadtree = null;
+    this.indexDirty = true;
+    this.hovered = null;
+    this.frame = null;
+  }
+
+  setData(nodes, links, linkCounts) {
+    this.nodes = nodes;
+    this.links = links;
+    this.radii = new Map(nodes.map(n => [n.id, this.graph.getNodeRadius(n, linkCounts)]));
+    this.maxRadius = nodes.reduce((max, n) => Math.max(max, this.radii.get(n.id)), 0);
+
+    this.neighbors = new Map(nodes.map(n => [n.id, new Set([n.id])]));
+    links.forEach(l => {
+      const sourceId = endpointId(l.source);
+      const targetId = endpointId(l.target);
+      this.neighbors.get(sourceId).add(targetId);
+      this.neighbors.get(targetId).add(sourceId);
+    });
+
+    // Fall back to relative degree when the exporter provided no scores
+    let maxDegree = 0;
+    linkCounts.forEach(count => { maxDegree = Math.max(maxDegree, count); });
+    this.importance = new Map(nodes.map(n => [
+      n.id,
+      typeof n.importance === 'number'
+        ? n.importance
+        : (maxDegree ? (linkCounts.get(n.id) || 0) / maxDegree : 1)
+    ]));
+
+    this.hovered = null;
+    this.invalidate();
+  }
+
+  resize(width, height) {
+    const dpr = window.devicePixelRatio || 1;
+    this.width = width;
+    this.height = height;
+    this.dpr = dpr;
+    this.canvas.width = Math.round(width * dpr);
+    this.canvas.height = Math.round(height * dpr);
+    this.canvas.style.width = `${width}px`;
+    this.canvas.style.height = `${height}px`;
+    this.scheduleDraw();
+  }
+
+  invalidate() {
+    this.indexDirty = true;
+    this.scheduleDraw();
+  }
+
+  index() {
+    if (this.indexDirty) {
+      this.quadtree = this.graph.d3.quadtree(this.nodes, d => d.x, d => d.y);
+      this.indexDirty = false;
+    }
+    return this.quadtree;
+  }
+
+  nodeAt(px, py) {
+    const [x, y] = this.graph.transform.invert([px, py]);
+    const node = this.index().find(x, y, this.maxRadius);
+    if (!node) return null;
+    const r = this.radii.get(node.id);
+    const dx = x - node.x;
+    const dy = y - node.y;
+    return dx * dx + dy * dy <= r * r ? node : null;
+  }
+
+  visibleNodes(x0, y0, x1, y1) {
+    const visible = [];
+    this.index().visit((quad, qx0, qy0, qx1, qy1) => {
+      if (!quad.length) {
+        let leaf = quad;
+        do {
+          const d = leaf.data;
+          if (d.x >= x0 && d.x <= x1 && d.y >= y0 && d.y <= y1) visible.push(d);
+        } while ((leaf = leaf.next));
+      }
+      return qx0 > x1 || qy0 > y1 || qx1 < x0 || qy1 < y0;
+    });
+    return visible;
+  }
+
+  bounds() {
+    let x0 = Infinity, y0 = Infinity, x1 = -Infinity, y1 = -Infinity;
+    this.nodes.forEach(n => {
+      const r = this.radii.get(n.id);
+      x0 = Math.min(x0, n.x - r);
+      y0 = Math.min(y0, n.y - r);
+      x1 = Math.max(x1, n.x + r);
+      y1 = Math.max(y1, n.y + r);
+    });
+    if (x0 === Infinity) return { x: 0, y: 0, width: 0, height: 0 };
+    return { x: x0, y: y0, width: x1 - x0, height: y1 - y0 };
+  }
+
+  scheduleDraw() {
+    if (this.frame) return;
+    this.frame = requestAnimationFrame(() => {
+      this.frame = null;
+      this.draw();
+    });
+  }
+
+  draw() {
+    const { ctx, hovered } = this;
+    const t = this.graph.transform;
+    const { showLabels, labelOffset, labelZoomThreshold } = this.graph.options;
+    const style = getComputedStyle(this.graph.rootContainer);
+    const nodeColor = style.getPropertyValue('--node-color').trim() || '#14b5ff';
+    const hoverColor = style.getPropertyValue('--node-hover-color').trim() || '#a855f7';
+    const linkColor = style.getPropertyValue('--link-color').trim() || 'rgba(20, 181, 255, 0.3)';
+    const linkHoverColor = style.getPropertyValue('--link-hover-color').trim() || 'rgba(168, 85, 247, 0.6)';
+    const textColor = style.getPropertyValue('--text-color').trim() || '#e0e0e0';
+
+    ctx.setTransform(this.dpr, 0, 0, this.dpr, 0, 0);
+    ctx.clearRect(0, 0, this.width, this.height);
+    ctx.translate(t.x, t.y);
+    ctx.scale(t.k, t.k);
+
+    // Viewport in graph coordinates, padded so partly visible nodes are kept
+    const [vx0, vy0] = t.invert([0, 0]);
+    const [vx1, vy1] = t.invert([this.width, this.height]);
+    const x0 = vx0 - this.maxRadius, y0 = vy0 - this.maxRadius;
+    const x1 = vx1 + this.maxRadius, y1 = vy1 + this.maxRadius;
+    const focus = hovered ? this.neighbors.get(hovered.id) : null;
+    const tagFilter = this.graph.tagFilter;
+
+    const highlightedLinks = [];
+    const filteredLinks = [];
+    ctx.globalAlpha = focus ? 0.3 : 1;
+    ctx.strokeStyle = linkColor;
+    ctx.lineWidth = 1 / t.k;
+    ctx.beginPath();
+    this.links.forEach(l => {
+      const a = l.source, b = l.target;
+      if (Math.max(a.x, b.x) < x0 || Math.min(a.x, b.x) > x1 ||
+          Math.max(a.y, b.y) < y0 || Math.min(a.y, b.y) > y1) return;
+      if (tagFilter && !(tagFilter.has(a.id) && tagFilter.has(b.id))) {
+        filteredLinks.push(l);
+        return;
+      }
+      if (focus && (a === hovered || b === hovered)) {
+        highlightedLinks.push(l);
+        return;
+      }
+      ctx.moveTo(a.x, a.y);
+      ctx.lineTo(b.x, b.y);
+    });
+    ctx.stroke();
+
+    // Matches the SVG renderer's .link.filtered-out opacity
+    if (filteredLinks.length) {
+      ctx.globalAlpha = 0.1;
+      ctx.beginPath();
+      filteredLinks.forEach(l => {
+        ctx.moveTo(l.source.x, l.source.y);
+        ctx.lineTo(l.target.x, l.target.y);
+      });
+      ctx.stroke();
+    }
+
+    if (highlightedLinks.length) {
+      ctx.globalAlpha = 1;
+      ctx.strokeStyle = linkHoverColor;
+      ctx.lineWidth = 2 / t.k;
+      ctx.beginPath();
+      highlightedLinks.forEach(l => {
+        ctx.moveTo(l.source.x, l.source.y);
+        ctx.lineTo(l.target.x, l.target.y);
+      });
+      ctx.stroke();
+    }
+
+    // One path per color and emphasis level keeps fill calls to a handful
+    const visible = this.visibleNodes(x0, y0, x1, y1);
+    const batches = new Map();
+    visible.forEach(n => {
+      const dimmed = (focus !== null && !focus.has(n.id)) ||
+        (tagFilter !== null && !tagFilter.has(n.id));
+      const color = n === hovered ? hoverColor : (n.color || nodeColor);
+      const key = `${dimmed ? 0.2 : 1}|${color}`;
+      if (!batches.has(key)) batches.set(key, []);
+      batches.get(key).push(n);
+    });
+    batches.forEach((batch, key) => {
+      const [alpha, color] = key.split('|');
+      ctx.globalAlpha = Number(alpha);
+      ctx.fillStyle = color;
+      ctx.beginPath();
+      batch.forEach(n => {
+        const r = this.radii.get(n.id);
+        if (r * t.k < 1.5) {
+          ctx.rect(n.x - r, n.y - r, 2 * r, 2 * r);
+        } else {
+          ctx.moveTo(n.x + r, n.y);
+          ctx.arc(n.x, n.y, r, 0, 2 * Math.PI);
+        }
+      });
+      ctx.fill();
+    });
+
+    if (showLabels) {
+      // Zoomed out only the most important notes are labeled; every label
+      // is shown once the zoom reaches labelZoomThreshold.
+      const minImportance = Math.max(0, 1 - t.k / labelZoomThreshold);
+      ctx.globalAlpha = 1;
+      ctx.fillStyle = textColor;
+      ctx.font = `${12 / t.k}px sans-serif`;
+      ctx.textAlign = 'center';
+      visible.forEach(n => {
+        const emphasized = focus !== null && focus.has(n.id);
+        if (!emphasized && this.importance.get(n.id) < minImportance) return;
+        if (focus && !emphasized) return;
+        if (tagFilter && !tagFilter.has(n.id)) return;
+        ctx.fillText(n.title || n.id, n.x, n.y + this.radii.get(n.id) + labelOffset / t.k);
+      });
+    }
+
+    ctx.globalAlpha = 1;
+  }
+
+  destroy() {
+    if (this.frame) cancelAnimationFrame(this.frame);
+    this.frame = null;
+  }
+}
 
 class NotesGraph {
   constructor(containerSelector, options = {}) {
@@ -28,6 +366,11 @@ class NotesGraph {
       showControls: options.showControls !== false,
       onNodeClick: options.onNodeClick || null,
       baseUrl: options.baseUrl || '',
+      cacheGraph: options.cacheGraph !== false,
+      renderer: options.renderer || 'auto',
+      canvasThreshold: options.canvasThreshold || 1000,
+      labelZoomThreshold: options.labelZoomThreshold || 1.5,
+      tagIndexUrl: options.tagIndexUrl || null,
       ...options
     };
     
@@ -36,6 +379,13 @@ class NotesGraph {
     this.svg = null;
     this.g = null;
     this.zoom = null;
+    this.zoomSurface = null;
+    this.transform = null;
+    this.canvas = null;
+    this.canvasRenderer = null;
+    this.tagIndex = null;
+    this.tagIndexLoaded = false;
+    this.tagFilter = null;
     this.d3 = null;
     this.darkMode = true;
     
@@ -136,6 +486,7 @@ class NotesGraph {
       .graph-tooltip .tooltip-tags { display: flex; flex-wrap: wrap; gap: 4px; margin-top: 8px; }
       .graph-tooltip .tooltip-tag { padding: 2px 8px; background: var(--link-color, rgba(20, 181, 255, 0.3)); border-radius: 12px; font-size: 11px; }
       .graph-svg { width: 100%; height: 100%; display: block; }
+      .graph-canvas { display: block; }
     `;
     document.head.appendChild(style);
   }
@@ -162,13 +513,102 @@ class NotesGraph {
   setupZoom() {
     const { d3 } = this;
     
+    this.transform = d3.zoomIdentity;
     this.zoom = d3.zoom()
       .scaleExtent([0.1, 4])
       .on('zoom', (event) => {
+        this.transform = event.transform;
         this.g.attr('transform', event.transform);
+        if (this.canvasRenderer) this.canvasRenderer.scheduleDraw();
       });
 
     this.svg.call(this.zoom);
+    this.zoomSurface = this.svg;
+  }
+
+  setupCanvas() {
+    const { d3 } = this;
+
+    const canvas = document.createElement('canvas');
+    canvas.className = 'graph-canvas';
+    this.rootContainer.appendChild(canvas);
+    this.canvas = canvas;
+    this.canvasRenderer = new CanvasRenderer(this, canvas);
+    this.canvasRenderer.resize(this.width, this.height);
+
+    const drag = d3.drag()
+      .container(canvas)
+      .subject((event) => this.canvasRenderer.nodeAt(event.x, event.y))
+      .on('start', (event) => {
+        if (!event.active) this.simulation.alphaTarget(0.3).restart();
+        event.subject.fx = event.subject.x;
+        event.subject.fy = event.subject.y;
+      })
+      .on('drag', (event) => {
+        const [x, y] = this.transform.invert(d3.pointer(event, canvas));
+        event.subject.fx = x;
+        event.subject.fy = y;
+      })
+      .on('end', (event) => {
+        if (!event.active) this.simulation.alphaTarget(0);
+        event.subject.fx = null;
+        event.subject.fy = null;
+      });
+
+    d3.select(canvas).call(drag).call(this.zoom);
+
+    canvas.addEventListener('mousemove', (event) => {
+      const [x, y] = d3.pointer(event, canvas);
+      const node = this.canvasRenderer.nodeAt(x, y);
+      const tooltip = this.elements.tooltip;
+
+      if (node !== this.canvasRenderer.hovered) {
+        this.canvasRenderer.hovered = node;
+        canvas.style.cursor = node ? 'pointer' : 'grab';
+        if (tooltip) {
+          if (node) {
+            tooltip.innerHTML = this.buildTooltipContent(node);
+            tooltip.classList.remove('hidden');
+          } else {
+            tooltip.classList.add('hidden');
+          }
+        }
+        this.canvasRenderer.scheduleDraw();
+      }
+      if (node && tooltip) this.positionTooltip(event, tooltip);
+    });
+
+    canvas.addEventListener('mouseleave', () => {
+      this.canvasRenderer.hovered = null;
+      if (this.elements.tooltip) this.elements.tooltip.classList.add('hidden');
+      this.canvasRenderer.scheduleDraw();
+    });
+
+    canvas.addEventListener('click', (event) => {
+      const [x, y] = d3.pointer(event, canvas);
+      const node = this.canvasRenderer.nodeAt(x, y);
+      if (node) this.handleNodeClick(event, node);
+    });
+  }
+
+  useCanvas() {
+    const { renderer, canvasThreshold } = this.options;
+    return renderer === 'canvas' ||
+      (renderer === 'auto' && this.data.nodes.length > canvasThreshold);
+  }
+
+  selectSurface(useCanvas) {
+    const { d3 } = this;
+    if (useCanvas && !this.canvas) this.setupCanvas();
+
+    this.container.style.display = useCanvas ? 'none' : 'block';
+    if (this.canvas) this.canvas.style.display = useCanvas ? 'block' : 'none';
+
+    const surface = useCanvas ? d3.select(this.canvas) : this.svg;
+    if (surface !== this.zoomSurface) {
+      this.zoomSurface = surface;
+      surface.call(this.zoom.transform, d3.zoomIdentity);
+    }
   }
 
   setupControls() {
@@ -195,14 +635,14 @@ class NotesGraph {
 
   zoomBy(factor) {
     const { d3 } = this;
-    this.svg.transition()
+    this.zoomSurface.transition()
       .duration(300)
       .call(this.zoom.scaleBy, factor);
   }
 
   resetZoom() {
     const { d3 } = this;
-    this.svg.transition()
+    this.zoomSurface.transition()
       .duration(500)
       .call(this.zoom.transform, d3.zoomIdentity);
   }
@@ -220,6 +660,10 @@ class NotesGraph {
       .attr('width', this.width)
       .attr('height', this.height);
 
+    if (this.canvasRenderer) {
+      this.canvasRenderer.resize(this.width, this.height);
+    }
+
     if (this.simulation) {
       this.simulation
         .force('center', this.d3.forceCenter(this.width / 2, this.height / 2))
@@ -230,20 +674,118 @@ class NotesGraph {
 
   async loadData(url) {
     try {
-      const response = await fetch(url);
-      if (!response.ok) throw new Error(`Failed to load: ${response.status}`);
-      this.data = await response.json();
+      this.data = this.options.cacheGraph
+        ? await this.fetchVersionedData(url)
+        : await fetchJSON(url);
+      if (this.options.tagIndexUrl && !this.tagIndexLoaded) {
+        await this.loadTagIndex(this.options.tagIndexUrl);
+      }
+      this.resetTagIndex();
       this.render();
     } catch (error) {
       console.error('Error loading graph data:', error);
     }
   }
 
+  /**
+   * Bring the locally cached graph up to date by applying the deltas listed
+   * in `<name>.versions.json`, falling back to the full graph when the cache
+   * is empty or too far behind.
+   */
+  async fetchVersionedData(url) {
+    const graphUrl = new URL(url, window.location.href);
+    const versionsUrl = new URL(graphUrl.pathname.replace(/\.json$/, '.versions.json'), graphUrl);
+
+    let manifest;
+    try {
+      manifest = await fetchJSON(versionsUrl, { cache: 'no-cache' });
+    } catch (error) {
+      return fetchJSON(graphUrl);
+    }
+
+    const cacheKey = graphUrl.href;
+    const cached = await readCachedGraph(cacheKey);
+    if (cached) {
+      const deltas = new Map(manifest.deltas.map(d => [d.from, d]));
+      let { version, data } = cached;
+      let steps = 0;
+      while (version !== manifest.version && deltas.has(version) && steps++ < deltas.size) {
+        const entry = deltas.get(version);
+        data = applyGraphDelta(data, await fetchJSON(new URL(entry.file, versionsUrl)));
+        version = entry.to;
+      }
+      if (version === manifest.version) {
+        if (version !== cached.version) {
+          await writeCachedGraph(cacheKey, { version, data });
+        }
+        return data;
+      }
+    }
+
+    const data = await fetchJSON(graphUrl, { cache: 'no-cache' });
+    const version = (data.metadata && data.metadata.version) || manifest.version;
+    await writeCachedGraph(cacheKey, { version, data });
+    return data;
+  }
+
   setData(data) {
     this.data = data;
+    this.resetTagIndex();
     this.render();
   }
 
+  /**
+   * Load the compact tag index written by `convert.py --generate-graph`:
+   * `{ "notes": [ids...], "tags": { "a/b": [positions in notes] } }`.
+   */
+  async loadTagIndex(url) {
+    try {
+      const index = await fetchJSON(url);
+      this.tagIndex = new Map(Object.entries(index.tags).map(
+        ([tag, positions]) => [tag, positions.map(i => index.notes[i])]
+      ));
+      this.tagIndexLoaded = true;
+    } catch (error) {
+      console.error('Error loading tag index:', error);
+    }
+  }
+
+  resetTagIndex() {
+    if (!this.tagIndexLoaded) this.tagIndex = null;
+  }
+
+  notesWithTag(tag) {
+    if (!this.tagIndex) this.tagIndex = buildTagIndex(this.data.nodes);
+    return this.tagIndex.get(normalizeTag(tag)) || [];
+  }
+
+  tags() {
+    if (!this.tagIndex) this.tagIndex = buildTagIndex(this.data.nodes);
+    return [...this.tagIndex.keys()];
+  }
+
+  filterByTag(tag) {
+    this.tagFilter = tag ? new Set(this.notesWithTag(tag)) : null;
+    this.applyTagFilter();
+  }
+
+  applyTagFilter() {
+    const filter = this.tagFilter;
+
+    if (this.canvasRenderer && this.zoomSurface !== this.svg) {
+      this.canvasRenderer.scheduleDraw();
+      return;
+    }
+
+    this.nodesGroup.selectAll('circle')
+      .classed('filtered-out', d => filter !== null && !filter.has(d.id));
+    this.linksGroup.selectAll('line')
+      .classed('filtered-out', l => filter !== null &&
+        !(filter.has(endpointId(l.source)) && filter.has(endpointId(l.target))));
+    this.labelsGroup.selectAll('text')
+      .classed('filtered-out', d => filter !== null && !filter.has(d.id));
+  }
+
   render() {
     const { d3 } = this;
     const { nodes, links } = this.data;
@@ -276,6 +818,16 @@ class NotesGraph {
       .force('center', d3.forceCenter(this.width / 2, this.height / 2))
       .force('collision', d3.forceCollide().radius(d => this.getNodeRadius(d, linkCounts) + 5));
 
+    const useCanvas = this.useCanvas();
+    this.selectSurface(useCanvas);
+
+    if (useCanvas) {
+      this.canvasRenderer.setData(nodes, processedLinks, linkCounts);
+      this.simulation.on('tick', () => this.canvasRenderer.invalidate());
+      this.zoomToFit();
+      return;
+    }
+
     const link = this.linksGroup.selectAll('line')
       .data(processedLinks)
       .join('line')
@@ -321,6 +873,7 @@ class NotesGraph {
       }
     });
 
+    this.applyTagFilter();
     this.zoomToFit();
   }
 
@@ -454,7 +1007,9 @@ class NotesGraph {
     if (nodes.length === 0) return;
 
     setTimeout(() => {
-      const bounds = this.g.node().getBBox();
+      const bounds = this.zoomSurface === this.svg
+        ? this.g.node().getBBox()
+        : this.canvasRenderer.bounds();
       const fullWidth = this.width;
       const fullHeight = this.height;
       const width = bounds.width;
@@ -467,7 +1022,7 @@ class NotesGraph {
       const scale = 0.8 / Math.max(width / fullWidth, height / fullHeight);
       const translate = [fullWidth / 2 - scale * midX, fullHeight / 2 - scale * midY];
 
-      this.svg.transition()
+      this.zoomSurface.transition()
         .duration(750)
         .call(
           this.zoom.transform,
@@ -482,6 +1037,10 @@ class NotesGraph {
     }
     window.removeEventListener('resize', this.handleResize);
     this.svg.selectAll('*').remove();
+    if (this.canvasRenderer) {
+      this.canvasRenderer.destroy();
+      this.canvas.remove();
+    }
   }
 }
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Pathological Input Benchmark
+
+Runs the converter over a corpus of adversarial notes at doubling sizes and
+checks that conversion time grows linearly. A linear scanner roughly doubles
+its time when the input doubles; a backtracking pattern roughly quadruples it.
+
+Usage:
+    python benchmark.py [--base-size N] [--doublings K] [--max-ratio R]
+"""
+
+import sys
+import time
+import argparse
+
+from convert import ObsidianToPreText
+
+
+# Each entry builds a note body of roughly n repetitions of a hostile pattern.
+PATHOLOGICAL_CORPUS = {
+    'lone-inline-dollar': lambda n: '$' + ' a$$b' * n,
+    'dollar-runs': lambda n: '$a$$' * n,
+    'unclosed-block-math': lambda n: '$$ x' + ' y' * n,
+    'unclosed-code-fence': lambda n: '```python\n' + 'x = 1\n' * n,
+    'fence-like-runs': lambda n: '```x```y' * n,
+    'callout-trailing-space': lambda n: '> [!note] Title' + ' ' * n,
+    'callout-long-body': lambda n: '> [!note] Title\n' + '>    \n' * n,
+    'unclosed-wikilinks': lambda n: '[[a' * n,
+    'unclosed-wikilink-display': lambda n: '[[a|b' * n,
+    'unclosed-markdown-links': lambda n: '[a](x' * n,
+    'unclosed-links-with-spaces': lambda n: '[a](x y' * n,
+    'unclosed-bold': lambda n: '**a*' * n,
+}
+
+
+def time_note(converter: ObsidianToPreText, content: str, repeats: int) -> float:
+    """Best-of-N wall time to parse and convert one note body."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        converter.extract_wikilinks(content)
+        converter.convert_content(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check that conversion time stays linear on pathological notes'
+    )
+    parser.add_argument('--base-size', type=int, default=2000,
+                        help='Pattern repetitions at the smallest size')
+    parser.add_argument('--doublings', type=int, default=4,
+                        help='Number of times the input size is doubled')
+    parser.add_argument('--max-ratio', type=float, default=3.0,
+                        help='Largest allowed time ratio per doubling')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Runs per size; the fastest is kept')
+    args = parser.parse_args()
+
+    # time_note never reads or writes files, so the directories are unused
+    converter = ObsidianToPreText('.', '.')
+
+    sizes = [args.base_size * 2 ** k for k in range(args.doublings + 1)]
+    failures = []
+
+    print(f"{'input':<28}{'chars':>10}{'time (ms)':>12}{'worst ratio':>14}")
+    for name, build in PATHOLOGICAL_CORPUS.items():
+        timings = []
+        for n in sizes:
+            content = build(n)
+            timings.append((len(content), time_note(converter, content, args.repeats)))
+
+        # Ignore timings too small to measure reliably
+        ratios = [
+            later / earlier
+            for (_, earlier), (_, later) in zip(timings, timings[1:])
+            if earlier > 1e-4
+        ]
+        worst = max(ratios, default=0.0)
+        chars, elapsed = timings[-1]
+        print(f"{name:<28}{chars:>10}{elapsed * 1000:>12.2f}{worst:>14.2f}")
+
+        if worst > args.max_ratio:
+            failures.append(name)
+
+    if failures:
+        print(f"\nSuperlinear growth detected: {', '.join(failures)}")
+        sys.exit(1)
+
+    print("\nAll inputs scale linearly.")
+
+
+if __name__ == '__main__':
+    main()
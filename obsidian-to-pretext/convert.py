@@ -9,6 +9,9 @@ Converts Obsidian Markdown notes to PreTeXt XML format, handling:
 - One note → one <section>
 - Stable xml:id generation
 - Backlink tracking
+- Tag index (nested a/b tags) with generated tag pages
+- Optional SQLite vault store for incremental runs
+- Per-note conversion time budget (offending notes are quarantined)
 
 Usage:
     python convert.py input_dir output_dir [--generate-graph]
@@ -18,8 +21,12 @@ import re
 import os
 import sys
 import json
+import time
+import signal
 import argparse
 import hashlib
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Set, Tuple
@@ -31,6 +38,8 @@ except ImportError:
     print("PyYAML required: pip install pyyaml")
     sys.exit(1)
 
+from vault_store import VaultStore
+
 
 @dataclass
 class Note:
@@ -48,24 +57,36 @@ class Note:
     frontmatter: Dict = field(default_factory=dict)
 
 
+class ConversionTimeout(Exception):
+    """Raised when converting a single note exceeds its time budget."""
+
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"conversion exceeded {budget:g}s budget in {stage}")
+        self.stage = stage
+        self.budget = budget
+
+
 class ObsidianToPreText:
     """Converts Obsidian vault to PreTeXt XML."""
 
     FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
-    WIKILINK_PATTERN = re.compile(r'\[\[([^\]|]+)(?:\|([^\]]+))?\]\]')
-    INLINE_MATH_PATTERN = re.compile(r'(?<!\$)\$(?!\$)(.+?)(?<!\$)\$(?!\$)')
-    BLOCK_MATH_PATTERN = re.compile(r'\$\$(.*?)\$\$', re.DOTALL)
+    # Link text may not contain '[' or newlines, so a failed match can never
+    # scan past the next opening bracket and matching stays linear.
+    WIKILINK_PATTERN = re.compile(r'\[\[([^\[\]|\n]+)(?:\|([^\[\]\n]+))?\]\]')
     HEADER_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
     BOLD_PATTERN = re.compile(r'\*\*(.+?)\*\*')
     ITALIC_PATTERN = re.compile(r'(?<!\*)\*([^*]+)\*(?!\*)')
     CODE_INLINE_PATTERN = re.compile(r'`([^`]+)`')
-    CODE_BLOCK_PATTERN = re.compile(r'```(\w*)\n(.*?)```', re.DOTALL)
+    CODE_FENCE_LANG_PATTERN = re.compile(r'(\w*)\n')
     UNORDERED_LIST_PATTERN = re.compile(r'^(\s*)[-*+]\s+(.+)$', re.MULTILINE)
     ORDERED_LIST_PATTERN = re.compile(r'^(\s*)\d+\.\s+(.+)$', re.MULTILINE)
     BLOCKQUOTE_PATTERN = re.compile(r'^>\s*(.+)$', re.MULTILINE)
     IMAGE_PATTERN = re.compile(r'!\[\[([^\]]+)\]\]|!\[([^\]]*)\]\(([^)]+)\)')
-    LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-    CALLOUT_PATTERN = re.compile(r'^>\s*\[!(\w+)\][-+]?\s*(.*?)$', re.MULTILINE)
+    LINK_PATTERN = re.compile(r'\[([^\[\]\n]+)\]\(([^)\[]+)\)')
+    CALLOUT_PATTERN = re.compile(r'>\s*\[!(\w+)\][-+]?\s*(.*)')
+
+    # Notes always get a 'sec-' prefix, so this cannot collide with a note
+    TAG_INDEX_ID = 'tags-index'
 
     MARKDOWN_TO_PRETEXT = {
         'bold': ('<term>', '</term>'),
@@ -73,13 +94,21 @@ class ObsidianToPreText:
         'code_inline': ('<c>', '</c>'),
     }
 
-    def __init__(self, input_dir: str, output_dir: str, verbose: bool = False):
+    def __init__(self, input_dir: str, output_dir: str, verbose: bool = False,
+                 note_time_budget: Optional[float] = 5.0,
+                 store: Optional[VaultStore] = None):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.verbose = verbose
+        self.note_time_budget = note_time_budget
+        self.store = store
         self.notes: Dict[str, Note] = {}
         self.title_to_id: Dict[str, str] = {}
         self.alias_to_id: Dict[str, str] = {}
+        self.tag_index: Dict[str, List[str]] = {}
+        self.quarantined: Dict[str, str] = {}
+        self._deadline: Optional[float] = None
+        self._current_stage = ''
 
     def log(self, message: str):
         if self.verbose:
@@ -108,7 +137,7 @@ class ObsidianToPreText:
         
         xml_id = f"sec-{base}"
         
-        if xml_id in [n.xml_id for n in self.notes.values()]:
+        if xml_id in self.notes:
             hash_suffix = hashlib.md5(str(filepath).encode()).hexdigest()[:6]
             xml_id = f"{xml_id}-{hash_suffix}"
         
@@ -170,19 +199,64 @@ class ObsidianToPreText:
 
     def convert_math(self, content: str) -> str:
         """Convert MathJax equations to PreTeXt format."""
-        def block_replace(match):
-            math = self.escape_math_xml(match.group(1).strip())
-            return f'__BLOCK_MATH_START__{math}__BLOCK_MATH_END__'
-        
-        content = self.BLOCK_MATH_PATTERN.sub(block_replace, content)
+        content = self.convert_block_math(content)
+        return self.convert_inline_math(content)
+
+    def convert_block_math(self, content: str) -> str:
+        """
+        Replace $$...$$ with block math markers.
         
-        def inline_replace(match):
-            math = self.escape_math_xml(match.group(1))
-            return f'<m>{math}</m>'
+        Each $$ pairs with the next $$; an unclosed $$ ends the scan, so
+        no opening is ever searched for more than once.
+        """
+        result = []
+        last = 0
+        start = content.find('$$')
+        while start != -1:
+            end = content.find('$$', start + 2)
+            if end == -1:
+                break
+            math = self.escape_math_xml(content[start + 2:end].strip())
+            result.append(content[last:start])
+            result.append(f'__BLOCK_MATH_START__{math}__BLOCK_MATH_END__')
+            last = end + 2
+            start = content.find('$$', last)
+        result.append(content[last:])
+        return ''.join(result)
+
+    def convert_inline_math(self, content: str) -> str:
+        """
+        Replace $...$ with <m> elements.
         
-        content = self.INLINE_MATH_PATTERN.sub(inline_replace, content)
+        Only a lone $ (not part of a $$ run) delimits inline math, and math
+        never spans lines, so the lone dollars of each line pair up in order.
+        """
+        lines = content.split('\n')
+        for index, line in enumerate(lines):
+            dollars = []
+            pos = line.find('$')
+            while pos != -1:
+                run_end = pos + 1
+                while run_end < len(line) and line[run_end] == '$':
+                    run_end += 1
+                if run_end - pos == 1:
+                    dollars.append(pos)
+                pos = line.find('$', run_end)
+            
+            if len(dollars) < 2:
+                continue
+            
+            pieces = []
+            last = 0
+            for open_pos, close_pos in zip(dollars[0::2], dollars[1::2]):
+                math = self.escape_math_xml(line[open_pos + 1:close_pos])
+                pieces.append(line[last:open_pos])
+                pieces.append(f'<m>{math}</m>')
+                last = close_pos + 1
+            pieces.append(line[last:])
+            lines[index] = ''.join(pieces)
         
-        return content
+        return '\n'.join(lines)
 
     def convert_headers(self, content: str) -> str:
         """Convert Markdown headers to header markers for later processing."""
@@ -249,47 +323,87 @@ class ObsidianToPreText:
         return content
 
     def convert_code_blocks(self, content: str) -> str:
-        """Convert fenced code blocks to PreTeXt."""
-        def replace_block(match):
-            lang = match.group(1) or 'text'
-            code = match.group(2)
+        """
+        Convert fenced code blocks to PreTeXt.
+        
+        A fence opens with ``` followed by an optional language and a newline,
+        and closes at the next ```. An unclosed fence ends the scan.
+        """
+        result = []
+        last = 0
+        start = content.find('```')
+        while start != -1:
+            opening = self.CODE_FENCE_LANG_PATTERN.match(content, start + 3)
+            if not opening:
+                start = content.find('```', start + 1)
+                continue
+            
+            end = content.find('```', opening.end())
+            if end == -1:
+                break
+            
+            lang = opening.group(1) or 'text'
+            code = content[opening.end():end]
             code = code.replace('&', '&amp;')
             code = code.replace('<', '&lt;')
             code = code.replace('>', '&gt;')
-            return f'<program language="{lang}">\n<input>\n{code}</input>\n</program>'
+            result.append(content[last:start])
+            result.append(f'<program language="{lang}">\n<input>\n{code}</input>\n</program>')
+            last = end + 3
+            start = content.find('```', last)
         
-        return self.CODE_BLOCK_PATTERN.sub(replace_block, content)
+        result.append(content[last:])
+        return ''.join(result)
 
     def process_callouts(self, content: str) -> str:
-        """Process Obsidian callouts before other conversions."""
-        callout_block_pattern = re.compile(
-            r'^>\s*\[!(\w+)\][-+]?\s*(.*?)$\n((?:>\s*.*\n?)*)', 
-            re.MULTILINE
-        )
+        """
+        Process Obsidian callouts before other conversions.
         
-        def replace_callout(match):
-            callout_type = match.group(1).lower()
-            callout_title = match.group(2).strip()
-            callout_body = match.group(3)
-            
-            callout_body = re.sub(r'^>\s*', '', callout_body, flags=re.MULTILINE)
-            callout_body = callout_body.strip()
+        A callout is a `> [!type] title` line followed by the run of lines
+        starting with `>`; lines are scanned once, top to bottom.
+        """
+        lines = content.split('\n')
+        result = []
+        i = 0
+        while i < len(lines):
+            header = self.CALLOUT_PATTERN.match(lines[i])
+            if not header or i == len(lines) - 1:
+                result.append(lines[i])
+                i += 1
+                continue
             
-            type_map = {
-                'note': 'note',
-                'warning': 'warning',
-                'tip': 'insight',
-                'important': 'warning',
-                'example': 'example',
-                'info': 'note',
-            }
-            ptx_type = type_map.get(callout_type, 'note')
+            body_end = i + 1
+            while body_end < len(lines) and lines[body_end].startswith('>'):
+                body_end += 1
             
-            if callout_title:
-                return f'__CALLOUT_START_{ptx_type}__|{callout_title}|__CALLOUT_BODY__|{callout_body}|__CALLOUT_END__'
-            return f'__CALLOUT_START_{ptx_type}__|__CALLOUT_BODY__|{callout_body}|__CALLOUT_END__'
+            result.append(self.format_callout(
+                header.group(1), header.group(2), '\n'.join(lines[i + 1:body_end])
+            ))
+            i = body_end
+        
+        return '\n'.join(result)
+
+    def format_callout(self, callout_type: str, callout_title: str, callout_body: str) -> str:
+        """Build the callout marker consumed by finalize_structure."""
+        callout_type = callout_type.lower()
+        callout_title = callout_title.strip()
+        
+        callout_body = re.sub(r'^>\s*', '', callout_body, flags=re.MULTILINE)
+        callout_body = callout_body.strip()
+        
+        type_map = {
+            'note': 'note',
+            'warning': 'warning',
+            'tip': 'insight',
+            'important': 'warning',
+            'example': 'example',
+            'info': 'note',
+        }
+        ptx_type = type_map.get(callout_type, 'note')
         
-        return callout_block_pattern.sub(replace_callout, content)
+        if callout_title:
+            return f'__CALLOUT_START_{ptx_type}__|{callout_title}|__CALLOUT_BODY__|{callout_body}|__CALLOUT_END__'
+        return f'__CALLOUT_START_{ptx_type}__|__CALLOUT_BODY__|{callout_body}|__CALLOUT_END__'
 
     def convert_blockquotes(self, content: str) -> str:
         """Convert simple blockquotes to PreTeXt."""
@@ -432,32 +546,40 @@ class ObsidianToPreText:
         return '\n'.join(result)
 
     def convert_content(self, content: str) -> str:
-        """Apply all conversions to content."""
-        content = self.process_callouts(content)
-        content = self.convert_code_blocks(content)
-        content = self.convert_math(content)
-        content = self.convert_wikilinks(content)
-        content = self.convert_links(content)
-        content = self.convert_headers(content)
-        content = self.convert_lists(content)
-        content = self.convert_blockquotes(content)
-        content = self.convert_inline_formatting(content)
-        content = self.finalize_structure(content)
+        """Apply all conversions to content, checking the time budget between stages."""
+        stages = [
+            self.process_callouts,
+            self.convert_code_blocks,
+            self.convert_math,
+            self.convert_wikilinks,
+            self.convert_links,
+            self.convert_headers,
+            self.convert_lists,
+            self.convert_blockquotes,
+            self.convert_inline_formatting,
+            self.finalize_structure,
+        ]
+        for stage in stages:
+            self._current_stage = stage.__name__
+            content = stage(content)
+            if self._deadline is not None and time.monotonic() > self._deadline:
+                raise ConversionTimeout(self._current_stage, self.note_time_budget)
         
         content = re.sub(r'<p>\s*</p>', '', content)
         content = re.sub(r'\n{3,}', '\n\n', content)
         
         return content.strip()
 
-    def parse_note(self, filepath: Path) -> Note:
+    def parse_note(self, filepath: Path, raw_content: Optional[str] = None) -> Note:
         """Parse a single Obsidian note."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            raw_content = f.read()
+        if raw_content is None:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                raw_content = f.read()
         
         frontmatter, content = self.parse_frontmatter(raw_content)
         
         title = frontmatter.get('title', filepath.stem)
-        tags = frontmatter.get('tags', [])
+        tags = frontmatter.get('tags') or []
         if isinstance(tags, str):
             tags = [t.strip() for t in tags.split(',')]
         
@@ -492,6 +614,12 @@ class ObsidianToPreText:
 
     def compute_backlinks(self):
         """Compute backlinks for all notes."""
+        if self.store:
+            for target_id, sources in self.store.backlinks().items():
+                if target_id in self.notes:
+                    self.notes[target_id].backlinks.update(s for s in sources if s in self.notes)
+            return
+        
         for source_id, source_note in self.notes.items():
             for target_title in source_note.links_to:
                 target_id = self.title_to_id.get(target_title.lower())
@@ -523,22 +651,196 @@ class ObsidianToPreText:
 {converted_content}
 {backlinks_section}
 </section>
+'''
+
+    @contextmanager
+    def time_budget(self):
+        """
+        Limit the time spent converting one note to note_time_budget seconds.
+        
+        The budget is checked between conversion stages. On POSIX, when running
+        in the main thread, a SIGALRM timer also interrupts a stage that stalls.
+        """
+        if not self.note_time_budget:
+            yield
+            return
+        
+        def on_alarm(signum, frame):
+            raise ConversionTimeout(self._current_stage, self.note_time_budget)
+        
+        use_alarm = (hasattr(signal, 'setitimer')
+                     and threading.current_thread() is threading.main_thread())
+        if use_alarm:
+            previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.note_time_budget)
+        
+        self._deadline = time.monotonic() + self.note_time_budget
+        try:
+            yield
+        finally:
+            self._deadline = None
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+
+    def generate_quarantine_section(self, note: Note, reason: str) -> str:
+        """Generate a placeholder section for a note that could not be converted."""
+        return f'''<!-- quarantined: {reason} -->
+<section xml:id="{note.xml_id}">
+<title>{note.title}</title>
+
+<p>This note could not be converted and has been quarantined.</p>
+</section>
 '''
 
     def scan_notes(self):
         """Scan input directory for Markdown files."""
         self.log(f"Scanning {self.input_dir} for notes...")
+        md_files = [f for f in self.input_dir.rglob('*.md') if not f.name.startswith('.')]
         
-        for md_file in self.input_dir.rglob('*.md'):
-            if md_file.name.startswith('.'):
-                continue
-            
+        if self.store:
+            self.sync_store(md_files)
+            tag_index = {}
+            for tag, note_ids in self.store.tag_index().items():
+                present = [i for i in note_ids if i in self.notes]
+                if present:
+                    tag_index[tag] = present
+            self.tag_index = self.sort_tag_index(tag_index)
+            return
+        
+        tag_index: Dict[str, Set[str]] = {}
+        for md_file in md_files:
             try:
                 note = self.parse_note(md_file)
                 self.notes[note.xml_id] = note
                 self.log(f"Parsed: {note.title} -> {note.xml_id}")
             except Exception as e:
                 print(f"[ERROR] Failed to parse {md_file}: {e}")
+                continue
+            
+            for tag in self.expand_tags(note.tags):
+                tag_index.setdefault(tag, set()).add(note.xml_id)
+        
+        self.tag_index = self.sort_tag_index(tag_index)
+
+    def sort_tag_index(self, tag_index: Dict) -> Dict[str, List[str]]:
+        """Sort note ids, and tags by path components so nested tags follow their parent."""
+        return {
+            tag: sorted(ids)
+            for tag, ids in sorted(tag_index.items(), key=lambda item: item[0].split('/'))
+        }
+
+    def sync_store(self, md_files: List[Path]):
+        """
+        Bring the vault store up to date and load all notes from it.
+        
+        Files whose stat or content hash match the store are loaded without
+        parsing. Changed and new files are parsed and upserted, and rows for
+        deleted files or files that fail to parse are removed.
+        """
+        stored = self.store.file_states()
+        unchanged = []
+        changed = []
+        failed = set()
+        
+        for md_file in md_files:
+            path = md_file.relative_to(self.input_dir).as_posix()
+            stat = md_file.stat()
+            state = stored.get(path)
+            if state and state[:2] == (stat.st_mtime_ns, stat.st_size):
+                unchanged.append(path)
+                continue
+            
+            try:
+                with open(md_file, 'r', encoding='utf-8') as f:
+                    raw_content = f.read()
+            except Exception as e:
+                print(f"[ERROR] Failed to parse {md_file}: {e}")
+                failed.add(path)
+                continue
+            content_hash = hashlib.sha256(raw_content.encode('utf-8')).hexdigest()
+            if state and state[2] == content_hash:
+                self.store.touch(path, stat.st_mtime_ns, stat.st_size)
+                unchanged.append(path)
+            else:
+                changed.append((md_file, path, raw_content, content_hash, stat))
+        
+        # Load unchanged notes first so new notes cannot take their xml:ids
+        for record in self.store.load_notes(unchanged):
+            note = Note(
+                filepath=self.input_dir / record['path'],
+                title=record['title'],
+                xml_id=record['xml_id'],
+                content=record['content'],
+                tags=record['tags'],
+                aliases=record['aliases'],
+                created=record['created'],
+                modified=record['modified'],
+                links_to=record['links_to'],
+                frontmatter=record['frontmatter']
+            )
+            self.notes[note.xml_id] = note
+        
+        for md_file, path, raw_content, content_hash, stat in changed:
+            try:
+                note = self.parse_note(md_file, raw_content)
+            except Exception as e:
+                print(f"[ERROR] Failed to parse {md_file}: {e}")
+                failed.add(path)
+                continue
+            
+            self.notes[note.xml_id] = note
+            self.store.upsert_note({
+                'xml_id': note.xml_id,
+                'path': path,
+                'title': note.title,
+                'content': note.content,
+                'content_hash': content_hash,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'tags': note.tags,
+                'expanded_tags': self.expand_tags(note.tags),
+                'aliases': note.aliases,
+                'created': note.created,
+                'modified': note.modified,
+                'links_to': note.links_to,
+                'frontmatter': note.frontmatter,
+            })
+            self.log(f"Parsed: {note.title} -> {note.xml_id}")
+        
+        seen = {md_file.relative_to(self.input_dir).as_posix() for md_file in md_files}
+        # Drop rows of notes that failed so their tags and links do not linger
+        removed = [path for path in stored if path not in seen or path in failed]
+        self.store.remove_paths(removed)
+        
+        if changed or removed:
+            self.store.resolve_links()
+        self.store.commit()
+        
+        self.log(f"Vault store: {len(unchanged)} unchanged, {len(changed)} updated, "
+                 f"{len(removed)} removed")
+
+    def expand_tags(self, tags: List) -> Set[str]:
+        """
+        Normalize tags and expand nested ones to every ancestor.
+        
+        'math/topology/metric' yields 'math', 'math/topology' and
+        'math/topology/metric'.
+        """
+        expanded = set()
+        for tag in tags:
+            parts = [p.strip() for p in str(tag).strip().lstrip('#').split('/')]
+            parts = [p for p in parts if p]
+            for depth in range(1, len(parts) + 1):
+                expanded.add('/'.join(parts[:depth]))
+        return expanded
+
+    def notes_with_tag(self, tag: str) -> List[str]:
+        """Sorted xml:ids of notes carrying a tag or any tag nested under it."""
+        tag = tag.strip().lstrip('#').strip('/')
+        if self.store:
+            return [i for i in self.store.notes_with_tag(tag) if i in self.notes]
+        return self.tag_index.get(tag, [])
 
     def convert_all(self):
         """Convert all notes to PreTeXt."""
@@ -549,7 +851,13 @@ class ObsidianToPreText:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         for note in self.notes.values():
-            pretext_content = self.generate_pretext_section(note)
+            try:
+                with self.time_budget():
+                    pretext_content = self.generate_pretext_section(note)
+            except ConversionTimeout as e:
+                self.quarantined[note.xml_id] = str(e)
+                print(f"[WARN] Quarantined {note.filepath}: {e}")
+                pretext_content = self.generate_quarantine_section(note, str(e))
             
             output_file = self.output_dir / f"{note.xml_id}.ptx"
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -557,15 +865,28 @@ class ObsidianToPreText:
             
             self.log(f"Written: {output_file}")
         
+        if self.tag_index:
+            self.generate_tag_index_section()
         self.generate_includes_file()
         
         print(f"\nConverted {len(self.notes)} notes to {self.output_dir}")
+        if self.quarantined:
+            print(f"Quarantined {len(self.quarantined)} notes:")
+            for xml_id, reason in sorted(self.quarantined.items()):
+                print(f"  {self.notes[xml_id].filepath}: {reason}")
 
     def generate_includes_file(self):
         """Generate a file with xi:include statements for all notes."""
+        if self.store:
+            ordered_ids = [i for i in self.store.note_ids_by_title() if i in self.notes]
+        else:
+            ordered_ids = [n.xml_id for n in sorted(self.notes.values(), key=lambda n: n.title.lower())]
+        
         includes = []
-        for note in sorted(self.notes.values(), key=lambda n: n.title.lower()):
-            includes.append(f'<xi:include href="{note.xml_id}.ptx"/>')
+        for xml_id in ordered_ids:
+            includes.append(f'<xi:include href="{xml_id}.ptx"/>')
+        if self.tag_index:
+            includes.append(f'<xi:include href="{self.TAG_INDEX_ID}.ptx"/>')
         
         includes_content = '\n'.join(includes)
         output_file = self.output_dir / '_includes.ptx'
@@ -579,8 +900,79 @@ class ObsidianToPreText:
         
         self.log(f"Generated includes file: {output_file}")
 
-    def generate_graph_json(self, output_path: str):
-        """Generate notes-graph.json for graph visualization."""
+    def tag_xml_id(self, tag: str, used: Set[str]) -> str:
+        """Stable xml:id for a tag's entry in the tag index section."""
+        base = re.sub(r'[^\w-]+', '-', tag.lower()).strip('-') or 'tag'
+        xml_id = f"tag-{base}"
+        
+        if xml_id in used:
+            hash_suffix = hashlib.md5(tag.encode()).hexdigest()[:6]
+            xml_id = f"{xml_id}-{hash_suffix}"
+        
+        used.add(xml_id)
+        return xml_id
+
+    def generate_tag_index_section(self):
+        """
+        Generate a section listing the notes under each tag.
+        
+        Each top-level tag becomes a subsection; tags nested under it get
+        their own titled paragraphs inside that subsection.
+        """
+        parts = []
+        used_ids: Set[str] = set()
+        for tag, note_ids in self.tag_index.items():
+            refs = ', '.join(f'<xref ref="{note_id}"/>' for note_id in note_ids)
+            
+            if '/' not in tag:
+                if parts:
+                    parts.append('</subsection>')
+                parts.append(f'<subsection xml:id="{self.tag_xml_id(tag, used_ids)}">')
+                parts.append(f'<title>{tag}</title>')
+                parts.append(f'<p>{refs}</p>')
+            else:
+                parts.append(f'<paragraphs xml:id="{self.tag_xml_id(tag, used_ids)}">')
+                parts.append(f'<title>{tag}</title>')
+                parts.append(f'<p>{refs}</p>')
+                parts.append('</paragraphs>')
+        parts.append('</subsection>')
+        
+        body = '\n'.join(parts)
+        output_file = self.output_dir / f'{self.TAG_INDEX_ID}.ptx'
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(f'''<!-- Auto-generated tag index -->
+<section xml:id="{self.TAG_INDEX_ID}">
+<title>Tag Index</title>
+
+{body}
+</section>
+''')
+        
+        self.log(f"Generated tag index: {output_file}")
+
+    def generate_tag_index_json(self, output_path: str):
+        """
+        Generate a compact tag index for the graph module.
+        
+        Note ids are stored once; each tag maps to positions in that list.
+        """
+        note_ids = sorted(self.notes)
+        position = {note_id: i for i, note_id in enumerate(note_ids)}
+        tag_data = {
+            'notes': note_ids,
+            'tags': {
+                tag: [position[note_id] for note_id in ids]
+                for tag, ids in self.tag_index.items()
+            }
+        }
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(tag_data, f, separators=(',', ':'))
+        
+        print(f"Generated tag index: {output_path}")
+
+    def build_graph_data(self) -> Dict:
+        """Build graph nodes and links from the in-memory notes."""
         nodes = []
         links = []
         
@@ -605,13 +997,6 @@ class ObsidianToPreText:
                         'target': target_id,
                         'type': 'reference'
                     })
-            
-            for backlink_id in note.backlinks:
-                links.append({
-                    'source': backlink_id,
-                    'target': note.xml_id,
-                    'type': 'backlink'
-                })
         
         unique_links = []
         seen = set()
@@ -621,10 +1006,14 @@ class ObsidianToPreText:
                 seen.add(key)
                 unique_links.append(link)
         
-        graph_data = {
+        return {
             'nodes': nodes,
             'links': unique_links
         }
+
+    def generate_graph_json(self, output_path: str):
+        """Generate notes-graph.json for graph visualization."""
+        graph_data = self.store.graph_data() if self.store else self.build_graph_data()
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(graph_data, f, indent=2)
@@ -643,6 +1032,14 @@ def main():
                         help='Generate notes-graph.json for visualization')
     parser.add_argument('--graph-output', default='notes-graph.json',
                         help='Path for graph JSON output')
+    parser.add_argument('--tag-index-output', default='tags-index.json',
+                        help='Path for tag index JSON output (written with --generate-graph)')
+    parser.add_argument('--note-time-budget', type=float, default=5.0,
+                        metavar='SECONDS',
+                        help='Quarantine notes whose conversion takes longer '
+                             'than this (0 disables)')
+    parser.add_argument('--store', metavar='PATH',
+                        help='SQLite vault store; only changed notes are re-parsed')
     
     args = parser.parse_args()
     
@@ -650,16 +1047,25 @@ def main():
         print(f"Error: Input directory not found: {args.input_dir}")
         sys.exit(1)
     
+    store = VaultStore(args.store) if args.store else None
+    
     converter = ObsidianToPreText(
         args.input_dir,
         args.output_dir,
-        verbose=args.verbose
+        verbose=args.verbose,
+        note_time_budget=args.note_time_budget,
+        store=store
     )
     
-    converter.convert_all()
-    
-    if args.generate_graph:
-        converter.generate_graph_json(args.graph_output)
+    try:
+        converter.convert_all()
+        
+        if args.generate_graph:
+            converter.generate_graph_json(args.graph_output)
+            converter.generate_tag_index_json(args.tag_index_output)
+    finally:
+        if store:
+            store.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+SQLite Vault Store
+
+Persists vault metadata between runs using the standard library sqlite3
+module in WAL mode:
+- notes with their body, content hash and file stat
+- aliases, tags (nested tags expanded) and wikilinks
+- links resolved to target xml:ids
+
+The converter upserts only notes whose files changed, and backlinks,
+includes, tag lookups and graph export become indexed queries. Other
+tools (e.g. generate-graph.py) can read the vault without parsing it.
+
+Usage:
+    with VaultStore('vault.db') as store:
+        store.backlinks()
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    xml_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    stem_key TEXT NOT NULL,
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    tags TEXT NOT NULL,
+    created TEXT,
+    modified TEXT,
+    frontmatter TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notes_title_key ON notes(title_key);
+CREATE INDEX IF NOT EXISTS idx_notes_stem_key ON notes(stem_key);
+
+CREATE TABLE IF NOT EXISTS aliases (
+    xml_id TEXT NOT NULL REFERENCES notes(xml_id) ON DELETE CASCADE,
+    alias TEXT NOT NULL,
+    alias_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (xml_id, alias)
+);
+CREATE INDEX IF NOT EXISTS idx_aliases_alias_key ON aliases(alias_key);
+
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    xml_id TEXT NOT NULL REFERENCES notes(xml_id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, xml_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tags_xml_id ON tags(xml_id);
+
+CREATE TABLE IF NOT EXISTS links (
+    source TEXT NOT NULL REFERENCES notes(xml_id) ON DELETE CASCADE,
+    target_title TEXT NOT NULL,
+    target_key TEXT NOT NULL,
+    target_id TEXT,
+    PRIMARY KEY (source, target_title)
+);
+CREATE INDEX IF NOT EXISTS idx_links_target_id ON links(target_id);
+"""
+
+
+class VaultStore:
+    """SQLite-backed store of vault metadata and resolved links."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def commit(self):
+        self.conn.commit()
+
+    def file_states(self) -> Dict[str, Tuple[int, int, str]]:
+        """Map each stored path to its (mtime_ns, size, content_hash)."""
+        rows = self.conn.execute('SELECT path, mtime_ns, size, content_hash FROM notes')
+        return {row['path']: (row['mtime_ns'], row['size'], row['content_hash']) for row in rows}
+
+    def load_notes(self, paths: Iterable[str]) -> List[Dict]:
+        """Load stored records for the given paths, in the order given."""
+        wanted = list(paths)
+        if not wanted:
+            return []
+
+        wanted_set = set(wanted)
+        records = {}
+        for row in self.conn.execute('SELECT * FROM notes'):
+            if row['path'] in wanted_set:
+                records[row['xml_id']] = {
+                    'xml_id': row['xml_id'],
+                    'path': row['path'],
+                    'title': row['title'],
+                    'content': row['content'],
+                    'tags': json.loads(row['tags']),
+                    'aliases': [],
+                    'created': row['created'],
+                    'modified': row['modified'],
+                    'links_to': set(),
+                    'frontmatter': json.loads(row['frontmatter']),
+                }
+
+        for row in self.conn.execute('SELECT xml_id, alias FROM aliases ORDER BY xml_id, position'):
+            if row['xml_id'] in records:
+                records[row['xml_id']]['aliases'].append(row['alias'])
+
+        for row in self.conn.execute('SELECT source, target_title FROM links'):
+            if row['source'] in records:
+                records[row['source']]['links_to'].add(row['target_title'])
+
+        by_path = {record['path']: record for record in records.values()}
+        return [by_path[path] for path in wanted if path in by_path]
+
+    def touch(self, path: str, mtime_ns: int, size: int):
+        """Record a new file stat for a note whose content did not change."""
+        self.conn.execute(
+            'UPDATE notes SET mtime_ns = ?, size = ? WHERE path = ?',
+            (mtime_ns, size, path)
+        )
+
+    def upsert_note(self, record: Dict):
+        """
+        Insert or replace one note and its aliases, tags and links.
+
+        `record` holds the fields returned by load_notes plus content_hash,
+        mtime_ns, size and expanded_tags.
+        """
+        xml_id = record['xml_id']
+        path = record['path']
+
+        # The note's id changes when its title does
+        self.conn.execute('DELETE FROM notes WHERE path = ? AND xml_id != ?', (path, xml_id))
+        self.conn.execute(
+            '''INSERT INTO notes (xml_id, path, title, title_key, stem_key, content,
+                                  content_hash, mtime_ns, size, tags, created, modified,
+                                  frontmatter)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(xml_id) DO UPDATE SET
+                   path = excluded.path,
+                   title = excluded.title,
+                   title_key = excluded.title_key,
+                   stem_key = excluded.stem_key,
+                   content = excluded.content,
+                   content_hash = excluded.content_hash,
+                   mtime_ns = excluded.mtime_ns,
+                   size = excluded.size,
+                   tags = excluded.tags,
+                   created = excluded.created,
+                   modified = excluded.modified,
+                   frontmatter = excluded.frontmatter''',
+            (
+                xml_id, path, record['title'], record['title'].lower(),
+                Path(path).stem.lower(), record['content'], record['content_hash'],
+                record['mtime_ns'], record['size'], json.dumps(record['tags'], default=str),
+                _text_or_none(record['created']), _text_or_none(record['modified']),
+                json.dumps(record['frontmatter'], default=str),
+            )
+        )
+
+        self.conn.execute('DELETE FROM aliases WHERE xml_id = ?', (xml_id,))
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO aliases (xml_id, alias, alias_key, position) VALUES (?, ?, ?, ?)',
+            [(xml_id, alias, alias.lower(), i) for i, alias in enumerate(record['aliases'])]
+        )
+
+        self.conn.execute('DELETE FROM tags WHERE xml_id = ?', (xml_id,))
+        self.conn.executemany(
+            'INSERT INTO tags (tag, xml_id) VALUES (?, ?)',
+            [(tag, xml_id) for tag in sorted(record['expanded_tags'])]
+        )
+
+        self.conn.execute('DELETE FROM links WHERE source = ?', (xml_id,))
+        self.conn.executemany(
+            'INSERT INTO links (source, target_title, target_key) VALUES (?, ?, ?)',
+            [(xml_id, title, title.lower()) for title in sorted(record['links_to'])]
+        )
+
+    def remove_paths(self, paths: Iterable[str]):
+        """Delete notes whose files no longer exist."""
+        self.conn.executemany('DELETE FROM notes WHERE path = ?', [(p,) for p in paths])
+
+    def resolve_links(self):
+        """Resolve every link's target title against titles, file stems and aliases."""
+        self.conn.execute('''
+            UPDATE links SET target_id = COALESCE(
+                (SELECT xml_id FROM notes WHERE title_key = links.target_key LIMIT 1),
+                (SELECT xml_id FROM notes WHERE stem_key = links.target_key LIMIT 1),
+                (SELECT xml_id FROM aliases WHERE alias_key = links.target_key LIMIT 1)
+            )
+        ''')
+
+    def backlinks(self) -> Dict[str, Set[str]]:
+        """Map each linked note to the ids of notes linking to it."""
+        backlinks: Dict[str, Set[str]] = {}
+        rows = self.conn.execute(
+            'SELECT target_id, source FROM links WHERE target_id IS NOT NULL'
+        )
+        for row in rows:
+            backlinks.setdefault(row['target_id'], set()).add(row['source'])
+        return backlinks
+
+    def backlinks_to(self, xml_id: str) -> List[str]:
+        """Sorted ids of notes linking to one note."""
+        rows = self.conn.execute(
+            'SELECT DISTINCT source FROM links WHERE target_id = ? ORDER BY source', (xml_id,)
+        )
+        return [row['source'] for row in rows]
+
+    def note_ids_by_title(self) -> List[str]:
+        """All note ids ordered case-insensitively by title."""
+        rows = self.conn.execute('SELECT xml_id FROM notes ORDER BY title_key')
+        return [row['xml_id'] for row in rows]
+
+    def notes_with_tag(self, tag: str) -> List[str]:
+        """Sorted ids of notes carrying a tag or any tag nested under it."""
+        rows = self.conn.execute(
+            'SELECT xml_id FROM tags WHERE tag = ? ORDER BY xml_id', (tag,)
+        )
+        return [row['xml_id'] for row in rows]
+
+    def tag_index(self) -> Dict[str, List[str]]:
+        """Map every tag to the sorted ids of notes carrying it."""
+        index: Dict[str, List[str]] = {}
+        for row in self.conn.execute('SELECT tag, xml_id FROM tags ORDER BY tag, xml_id'):
+            index.setdefault(row['tag'], []).append(row['xml_id'])
+        return index
+
+    def graph_data(self) -> Dict:
+        """Nodes and resolved reference links in the notes-graph.json format."""
+        aliases: Dict[str, List[str]] = {}
+        for row in self.conn.execute('SELECT xml_id, alias FROM aliases ORDER BY xml_id, position'):
+            aliases.setdefault(row['xml_id'], []).append(row['alias'])
+
+        nodes = []
+        rows = self.conn.execute(
+            '''SELECT xml_id, title, tags, substr(content, 1, 100) AS head,
+                      length(content) > 100 AS truncated
+               FROM notes ORDER BY xml_id'''
+        )
+        for row in rows:
+            description = row['head'].strip()
+            if row['truncated']:
+                description += '...'
+            nodes.append({
+                'id': row['xml_id'],
+                'title': row['title'],
+                'url': f"{row['xml_id']}.html",
+                'tags': json.loads(row['tags']),
+                'aliases': aliases.get(row['xml_id'], []),
+                'description': description
+            })
+
+        links = [
+            {'source': row['source'], 'target': row['target_id'], 'type': 'reference'}
+            for row in self.conn.execute(
+                '''SELECT DISTINCT source, target_id FROM links
+                   WHERE target_id IS NOT NULL ORDER BY source, target_id'''
+            )
+        ]
+
+        return {'nodes': nodes, 'links': links}
+
+
+def _text_or_none(value) -> Optional[str]:
+    return None if value is None else str(value)